@@ -6,8 +6,12 @@ using a local large language model (LLM) via the Ollama API.
 """
 
 import os
+import re
+import hashlib
 import streamlit as st
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 
@@ -19,37 +23,103 @@ import prompt_utils
 import utils
 
 
+# Ways of applying several selected transformations
+TRANSFORMATION_MODES = ["Combined prompt", "Sequential refinement", "Parallel variants"]
+
+# Uploaded text longer than this is truncated before it is sent to the model
+MAX_INPUT_CHARS = 100_000
+
+# Session state key prefix of the transformation multiselects
+SELECTION_WIDGET_PREFIX = "transformations_"
+
+# Minimum number of characters before the transformation list is filtered
+MIN_SEARCH_LENGTH = 2
+
+
 # Initialize session state variables if they don't exist
 def init_session_state():
+    # Read preferences once, and only when a preference-backed value is missing
+    preference_keys = ("selected_transformations", "ollama_model", "download_path")
+    if any(key not in st.session_state for key in preference_keys):
+        preferences = config.load_preferences()
+    
     if "input_text" not in st.session_state:
         st.session_state.input_text = ""
     if "output_text" not in st.session_state:
         st.session_state.output_text = ""
     if "selected_transformations" not in st.session_state:
         # Load from preferences
-        preferences = config.load_preferences()
         st.session_state.selected_transformations = preferences.get("last_used_transformations", ["basic_cleanup"])
+    if "transformation_mode" not in st.session_state:
+        st.session_state.transformation_mode = "Combined prompt"
     if "search_term" not in st.session_state:
         st.session_state.search_term = ""
+    if "active_search_term" not in st.session_state:
+        st.session_state.active_search_term = ""
     if "ollama_model" not in st.session_state:
         # Load from preferences
-        preferences = config.load_preferences()
         st.session_state.ollama_model = preferences.get("model", "llama3")
     if "download_path" not in st.session_state:
-        preferences = config.load_preferences()
         st.session_state.download_path = preferences.get("download_path", utils.get_desktop_path())
+    if "ollama_connected" not in st.session_state:
+        st.session_state.ollama_connected = False
+    if "preloaded_model" not in st.session_state:
+        st.session_state.preloaded_model = None
     if "available_models" not in st.session_state:
         st.session_state.available_models = []
     if "prompts_data" not in st.session_state:
         st.session_state.prompts_data = prompt_utils.load_prompts()
+    if "prompts_search_index" not in st.session_state:
+        # Built once per session from the prompts it searches
+        st.session_state.prompts_search_index = prompt_utils.build_search_index(st.session_state.prompts_data)
+    if "last_upload_hash" not in st.session_state:
+        st.session_state.last_upload_hash = None
     if "suggested_filename" not in st.session_state:
         st.session_state.suggested_filename = "transformed_text.txt"
     if "ollama_error" not in st.session_state:
         st.session_state.ollama_error = None
     if "transformation_success" not in st.session_state:
         st.session_state.transformation_success = False
-    if "transformation_categories" not in st.session_state:
-        st.session_state.transformation_categories = {}
+    if "transform_future" not in st.session_state:
+        st.session_state.transform_future = None
+        st.session_state.transform_cancel_event = None
+        st.session_state.transform_partial_output = []
+
+
+# Shared worker pool for running transformations off the script thread
+@st.cache_resource
+def get_executor():
+    return ThreadPoolExecutor(max_workers=2)
+
+
+# Run a transformation job (called in a worker thread, so no Streamlit calls here)
+def run_transformation(client, model, text, mode, prompts, names, cancel_event, partial_output):
+    if mode == "Sequential refinement":
+        # Apply each transformation in turn to the previous step's output
+        return ollama_api.chain_transform(client, model, text, prompts, cancel_event=cancel_event)
+    
+    if mode == "Parallel variants":
+        # Apply each transformation independently to the input, concurrently
+        results = client.generate_batch(
+            model=model,
+            prompt=text,
+            system_prompts=prompts,
+            cancel_event=cancel_event
+        )
+        return "\n\n---\n\n".join(
+            f"## {name}\n\n{result}" for name, result in zip(names, results)
+        )
+    
+    # Concatenate prompts and collect streamed chunks so the UI can show progress
+    system_prompt = ollama_api.concatenate_prompts(prompts)
+    for chunk in client.generate_text_stream(
+        model=model,
+        prompt=text,
+        system_prompt=system_prompt,
+        cancel_event=cancel_event
+    ):
+        partial_output.append(chunk)
+    return "".join(partial_output)
 
 
 # Apply text transformations using Ollama API
@@ -58,57 +128,91 @@ def transform_text():
         st.warning("Please enter some text to transform.")
         return
     
-    with st.spinner("Transforming text..."):
-        # Get selected transformation prompts
-        selected_prompts = []
-        for prompt_id in st.session_state.selected_transformations:
-            prompt_text = prompt_utils.get_prompt_text(prompt_id, st.session_state.prompts_data)
-            if prompt_text:
-                selected_prompts.append(prompt_text)
+    # Get selected transformation prompts
+    selected_prompts = []
+    selected_names = []
+    for prompt_id in st.session_state.selected_transformations:
+        prompt_text = prompt_utils.get_prompt_text(prompt_id, st.session_state.prompts_data)
+        if prompt_text:
+            selected_prompts.append(prompt_text)
+            selected_names.append(
+                prompt_utils.get_prompt_by_id(prompt_id, st.session_state.prompts_data).get("name", prompt_id)
+            )
+    
+    # If no transformations selected, use default
+    if not selected_prompts:
+        default_prompt = prompt_utils.get_default_prompt()
+        selected_prompts.append(default_prompt["prompt"])
+        selected_names.append(default_prompt["name"])
+    
+    # Submit the job to the background executor and keep its handles in session state
+    st.session_state.transform_cancel_event = threading.Event()
+    st.session_state.transform_partial_output = []
+    st.session_state.transform_future = get_executor().submit(
+        run_transformation,
+        get_ollama_client(),
+        st.session_state.ollama_model,
+        st.session_state.input_text,
+        st.session_state.transformation_mode,
+        selected_prompts,
+        selected_names,
+        st.session_state.transform_cancel_event,
+        st.session_state.transform_partial_output
+    )
+
+
+# Cancel the running transformation, discarding any result
+def cancel_transformation():
+    if st.session_state.transform_future is not None:
+        st.session_state.transform_cancel_event.set()
+        # A job still waiting for a worker never starts
+        st.session_state.transform_future.cancel()
+        st.session_state.transform_future = None
+
+
+# Collect the result of a finished transformation
+def collect_transformation():
+    future = st.session_state.transform_future
+    st.session_state.transform_future = None
+    
+    try:
+        transformed_text = future.result()
         
-        # If no transformations selected, use default
-        if not selected_prompts:
-            default_prompt = prompt_utils.get_default_prompt()
-            selected_prompts.append(default_prompt["prompt"])
+        # Update output text
+        st.session_state.output_text = transformed_text
         
-        # Concatenate prompts
-        system_prompt = ollama_api.concatenate_prompts(selected_prompts)
+        # Generate suggested filename
+        st.session_state.suggested_filename = utils.generate_suggested_filename(transformed_text)
         
-        # Initialize Ollama API client
-        client = ollama_api.OllamaAPI()
+        # Save the settings used for this transformation to preferences in one batch
+        config.queue_preference_updates({
+            "last_used_transformations": st.session_state.selected_transformations,
+            "model": st.session_state.ollama_model
+        })
         
-        try:
-            # Generate transformed text
-            transformed_text = client.generate_text(
-                model=st.session_state.ollama_model,
-                prompt=st.session_state.input_text,
-                system_prompt=system_prompt
-            )
-            
-            # Update output text
-            st.session_state.output_text = transformed_text
-            
-            # Generate suggested filename
-            st.session_state.suggested_filename = utils.generate_suggested_filename(transformed_text)
-            
-            # Save selected transformations to preferences
-            config.update_preference("last_used_transformations", st.session_state.selected_transformations)
-            
-            # Clear any previous errors
-            st.session_state.ollama_error = None
-            
-            # Set success flag
-            st.session_state.transformation_success = True
-            
-        except Exception as e:
-            st.session_state.ollama_error = str(e)
-            st.error(f"Error transforming text: {str(e)}")
-            st.session_state.transformation_success = False
+        # Clear any previous errors
+        st.session_state.ollama_error = None
+        
+        # Set success flag
+        st.session_state.transformation_success = True
+        
+    except Exception as e:
+        st.session_state.ollama_error = str(e)
+        st.error(f"Error transforming text: {str(e)}")
+        st.session_state.transformation_success = False
 
 
 # Handle file upload
 def handle_file_upload(uploaded_file):
-    if uploaded_file is not None:
+    if uploaded_file is None:
+        # Forget the last upload once it is removed, so re-uploading it is read again
+        st.session_state.last_upload_hash = None
+    else:
+        # Skip re-reading the same upload on every rerun
+        upload_hash = hashlib.sha1(uploaded_file.getvalue()).hexdigest()
+        if upload_hash == st.session_state.last_upload_hash:
+            return
+        
         try:
             # Determine file type
             file_type = uploaded_file.type
@@ -116,13 +220,58 @@ def handle_file_upload(uploaded_file):
             # Read file content
             text = file_utils.read_file(uploaded_file, file_type)
             
+            # Avoid sending very large documents to the model
+            if len(text) > MAX_INPUT_CHARS:
+                st.warning(
+                    f"The uploaded file contains {len(text):,} characters. "
+                    f"Only the first {MAX_INPUT_CHARS:,} will be used."
+                )
+                text = text[:MAX_INPUT_CHARS]
+            
             # Update input text
             st.session_state.input_text = text
+            st.session_state.last_upload_hash = upload_hash
             
         except Exception as e:
             st.error(f"Error reading file: {str(e)}")
 
 
+# Apply the search box value only once it is long enough to narrow the list
+def update_active_search():
+    search_term = st.session_state.search_term.strip()
+    if len(search_term) >= MIN_SEARCH_LENGTH:
+        st.session_state.active_search_term = search_term
+    else:
+        st.session_state.active_search_term = ""
+    
+    # The visible options change, so reseed the selection widgets from the current selection
+    reset_selection_widgets()
+
+
+# Forget the state of the transformation multiselects so they are reseeded on the next run
+def reset_selection_widgets():
+    for key in [key for key in st.session_state if str(key).startswith(SELECTION_WIDGET_PREFIX)]:
+        del st.session_state[key]
+
+
+# Render a multiselect of transformations with a stable key, seeded once from the current selection
+def selection_widget(label, key, names):
+    options = list(names)
+    if key not in st.session_state:
+        st.session_state[key] = [
+            prompt_id for prompt_id in options if prompt_id in st.session_state.selected_transformations
+        ]
+    
+    chosen = st.multiselect(
+        label,
+        options=options,
+        key=key,
+        format_func=names.get,
+        label_visibility="collapsed"
+    )
+    return options, chosen
+
+
 # Save output text to file
 def save_output_text(filename=None):
     if not st.session_state.output_text:
@@ -152,16 +301,32 @@ def clear_all():
     st.session_state.input_text = ""
     st.session_state.output_text = ""
     st.session_state.selected_transformations = ["basic_cleanup"]
+    reset_selection_widgets()
     st.session_state.suggested_filename = "transformed_text.txt"
     st.session_state.transformation_success = False
+    st.session_state.last_upload_hash = None
+
+
+# Shared Ollama API client, created once per server process
+@st.cache_resource
+def get_ollama_client():
+    return ollama_api.OllamaAPI()
+
+
+# Fetch connection status and model list, refreshed at most every 30 seconds
+@st.cache_data(ttl=30, show_spinner=False)
+def get_models_and_status():
+    client = get_ollama_client()
+    connected = client.check_connection()
+    models = client.list_models() if connected else []
+    return connected, models
 
 
 # Check Ollama connection and update available models
 def check_ollama_connection():
-    client = ollama_api.OllamaAPI()
-    if client.check_connection():
+    connected, models = get_models_and_status()
+    if connected:
         # Update available models
-        models = client.list_models()
         if not models:
             models = ["llama3"]  # Default if no models found
         st.session_state.available_models = models
@@ -195,46 +360,56 @@ def handle_clipboard_copy():
         st.warning("No text to copy.")
 
 
+# Keywords used to assign prompts to categories, checked in order
+CATEGORY_KEYWORDS = [
+    ("General", ("cleanup", "extract", "anonymization", "bullet", "summary")),
+    ("Professional", ("email", "letter", "minutes", "documentation", "status", "responder")),
+    ("Academic", ("academic", "scientific", "paper")),
+    ("Social Media", ("blog", "social", "media")),
+    ("Creative", ("poetry", "poem", "shakespeare", "tolkien", "creative")),
+    ("Technical", ("code", "technical", "development", "software")),
+    ("Format Conversion", ("format", "convert", "transform")),
+    ("Style", ("tone", "style", "formal", "casual")),
+    ("Prompting", ("prompt", "chatgpt", "ai")),
+]
+
+# One precompiled alternation per category so each check is a single regex scan
+CATEGORY_PATTERNS = [
+    (category, re.compile("|".join(map(re.escape, keywords))))
+    for category, keywords in CATEGORY_KEYWORDS
+]
+
+# Order in which categories are displayed as tabs
+CATEGORY_ORDER = [
+    "General",
+    "Format Conversion",
+    "Style",
+    "Professional",
+    "Academic",
+    "Creative",
+    "Technical",
+    "Social Media",
+    "Prompting",
+    "Other"
+]
+
+
 # Categorize prompts for better organization
 def categorize_prompts(prompts_data):
-    categories = {
-        "General": [],
-        "Format Conversion": [],
-        "Style": [],
-        "Professional": [],
-        "Academic": [],
-        "Creative": [],
-        "Technical": [],
-        "Social Media": [],
-        "Prompting": [],
-        "Other": []
-    }
+    categories = {category: [] for category in CATEGORY_ORDER}
     
     # Map prompts to categories based on keywords in name or description
     for prompt_id, prompt_data in prompts_data.items():
-        name = prompt_data.get("name", "").lower()
-        description = prompt_data.get("description", "").lower()
+        prompt_name = prompt_data.get("name", "Unknown")
         
-        if any(word in name or word in description for word in ["cleanup", "extract", "anonymization", "bullet", "summary"]):
-            categories["General"].append((prompt_id, prompt_data.get("name", "Unknown")))
-        elif any(word in name or word in description for word in ["email", "letter", "minutes", "documentation", "status", "responder"]):
-            categories["Professional"].append((prompt_id, prompt_data.get("name", "Unknown")))
-        elif any(word in name or word in description for word in ["academic", "scientific", "paper"]):
-            categories["Academic"].append((prompt_id, prompt_data.get("name", "Unknown")))
-        elif any(word in name or word in description for word in ["blog", "social", "media"]):
-            categories["Social Media"].append((prompt_id, prompt_data.get("name", "Unknown")))
-        elif any(word in name or word in description for word in ["poetry", "poem", "shakespeare", "tolkien", "creative"]):
-            categories["Creative"].append((prompt_id, prompt_data.get("name", "Unknown")))
-        elif any(word in name or word in description for word in ["code", "technical", "development", "software"]):
-            categories["Technical"].append((prompt_id, prompt_data.get("name", "Unknown")))
-        elif any(word in name or word in description for word in ["format", "convert", "transform"]):
-            categories["Format Conversion"].append((prompt_id, prompt_data.get("name", "Unknown")))
-        elif any(word in name or word in description for word in ["tone", "style", "formal", "casual"]):
-            categories["Style"].append((prompt_id, prompt_data.get("name", "Unknown")))
-        elif any(word in name or word in description for word in ["prompt", "chatgpt", "ai"]):
-            categories["Prompting"].append((prompt_id, prompt_data.get("name", "Unknown")))
-        else:
-            categories["Other"].append((prompt_id, prompt_data.get("name", "Unknown")))
+        # Build the lowercase text to search once per prompt
+        haystack = prompt_data.get("name", "").lower() + "\0" + prompt_data.get("description", "").lower()
+        
+        category = next(
+            (category for category, pattern in CATEGORY_PATTERNS if pattern.search(haystack)),
+            "Other"
+        )
+        categories[category].append((prompt_id, prompt_name))
     
     # Sort each category alphabetically by name
     for category in categories:
@@ -243,6 +418,232 @@ def categorize_prompts(prompts_data):
     return categories
 
 
+# Categorized prompts for a prompts file, cached across reruns and sessions.
+# Keyed on the file name: hashing the prompts dict costs more than categorizing it.
+@st.cache_data(show_spinner=False)
+def get_prompt_categories(prompts_file=prompt_utils.DEFAULT_PROMPTS_FILE):
+    return categorize_prompts(prompt_utils.load_prompts(prompts_file))
+
+
+# Progress of a background transformation, polled on its own while the job runs
+@st.fragment(run_every=0.5)
+def render_transformation_progress():
+    future = st.session_state.transform_future
+    if future is None or future.done():
+        # Rerun the whole page to collect the result and stop polling
+        st.rerun(scope="app")
+    
+    st.info("Transforming text...")
+    partial_text = "".join(st.session_state.transform_partial_output)
+    if partial_text:
+        st.markdown(partial_text)
+
+
+# Left column (Input), rerun on its own when its widgets change
+@st.fragment
+def render_input_column():
+    st.header("Input Text")
+    
+    # File upload
+    uploaded_file = st.file_uploader(
+        "Upload a file (TXT, Markdown, DOCX, PDF)",
+        type=["txt", "md", "docx", "pdf"]
+    )
+    handle_file_upload(uploaded_file)
+    
+    # Input buttons row
+    input_col1, input_col2 = st.columns(2)
+    with input_col1:
+        # Paste button
+        if st.button("📋 Paste from Clipboard"):
+            handle_clipboard_paste()
+    
+    with input_col2:
+        # Clear input button
+        if st.button("🧹 Clear Input"):
+            st.session_state.input_text = ""
+    
+    # Input text area
+    st.session_state.input_text = st.text_area(
+        "Enter or paste text here:",
+        value=st.session_state.input_text,
+        height=400
+    )
+
+
+# Middle column (Transformation Selector), rerun on its own when its widgets change
+@st.fragment
+def render_middle_column():
+    st.header("Transformations")
+    
+    # Model selection
+    model_options = st.session_state.available_models
+    
+    selected_model = st.selectbox(
+        "Select LLM Model:",
+        options=model_options,
+        index=model_options.index(st.session_state.ollama_model) if st.session_state.ollama_model in model_options else 0
+    )
+    
+    # Update model preference if changed
+    if selected_model != st.session_state.ollama_model:
+        st.session_state.ollama_model = selected_model
+        config.queue_preference_updates({"model": selected_model})
+    
+    # Warm up the selected model so the first transformation doesn't pay the load time
+    if st.session_state.ollama_connected and selected_model and selected_model != st.session_state.preloaded_model:
+        get_ollama_client().preload_model(selected_model)
+        st.session_state.preloaded_model = selected_model
+    
+    # How multiple transformations are applied
+    st.session_state.transformation_mode = st.radio(
+        "Apply transformations as:",
+        options=TRANSFORMATION_MODES,
+        index=TRANSFORMATION_MODES.index(st.session_state.transformation_mode),
+        horizontal=True
+    )
+    
+    transformation_running = st.session_state.transform_future is not None
+    
+    # Prominent Transform button at the top
+    transform_col1, transform_col2 = st.columns([3, 1])
+    with transform_col1:
+        if st.button(
+            "🔄 Transform Text",
+            disabled=not st.session_state.ollama_connected or transformation_running,
+            use_container_width=True,
+            type="primary"
+        ):
+            transform_text()
+            # Rerun the whole page so it shows the progress of the background job
+            if st.session_state.transform_future is not None:
+                st.rerun(scope="app")
+    with transform_col2:
+        st.button("✖ Cancel", on_click=cancel_transformation, disabled=not transformation_running)
+    
+    # Display success message if transformation was successful
+    if st.session_state.transformation_success:
+        st.success("Text transformed successfully!")
+        # Reset success flag after displaying
+        st.session_state.transformation_success = False
+    
+    # Search box for transformations (bound to session state)
+    st.text_input(
+        "Search transformations:",
+        key="search_term",
+        on_change=update_active_search
+    )
+    
+    # Display transformation options
+    st.write("Select transformations (up to 10):")
+    previous_selection = st.session_state.selected_transformations
+    shown_ids = []
+    chosen_ids = set()
+    
+    # Categorize prompts for better organization
+    if not st.session_state.active_search_term:
+        # Only categorize when not searching
+        categories = get_prompt_categories()
+        
+        # Create tabs for categories
+        category_tabs = st.tabs(list(categories.keys()))
+        
+        # One multiselect per category tab instead of a checkbox per prompt
+        for category, tab in zip(categories.keys(), category_tabs):
+            with tab:
+                options, chosen = selection_widget(
+                    category,
+                    f"{SELECTION_WIDGET_PREFIX}{category}",
+                    dict(categories[category])
+                )
+                shown_ids.extend(options)
+                chosen_ids.update(chosen)
+    else:
+        # Filter prompts based on search term
+        filtered_prompts = prompt_utils.filter_prompts(
+            st.session_state.prompts_data,
+            st.session_state.active_search_term,
+            search_index=st.session_state.prompts_search_index
+        )
+        
+        # When searching, display a single multiselect of filtered results
+        options, chosen = selection_widget(
+            "Matching transformations",
+            f"{SELECTION_WIDGET_PREFIX}search",
+            dict(prompt_utils.get_prompt_names_and_ids(filtered_prompts))
+        )
+        shown_ids.extend(options)
+        chosen_ids.update(chosen)
+    
+    # Keep earlier selections in order (including ones hidden by the search), then add new ones
+    shown = set(shown_ids)
+    selected_transformations = [
+        prompt_id for prompt_id in previous_selection
+        if prompt_id not in shown or prompt_id in chosen_ids
+    ]
+    selected_transformations.extend(
+        prompt_id for prompt_id in shown_ids
+        if prompt_id in chosen_ids and prompt_id not in previous_selection
+    )
+    
+    # Limit to 10 transformations
+    if len(selected_transformations) > 10:
+        st.warning("You can select up to 10 transformations. Only the first 10 will be applied.")
+        selected_transformations = selected_transformations[:10]
+    
+    # Update selected transformations in session state
+    st.session_state.selected_transformations = selected_transformations
+
+
+# Right column (Output), rerun on its own when its widgets change
+@st.fragment
+def render_output_column():
+    st.header("Output Text")
+    
+    # Output text area
+    st.session_state.output_text = st.text_area(
+        "Transformed text:",
+        value=st.session_state.output_text,
+        height=400
+    )
+    
+    # Output buttons row
+    output_col1, output_col2 = st.columns(2)
+    with output_col1:
+        # Copy to clipboard button
+        if st.button("📋 Copy to Clipboard"):
+            handle_clipboard_copy()
+    
+    with output_col2:
+        # Clear output button
+        if st.button("🧹 Clear Output"):
+            st.session_state.output_text = ""
+    
+    # Download section
+    st.subheader("Download Output")
+    
+    # Filename input
+    filename = st.text_input(
+        "Filename:",
+        value=st.session_state.suggested_filename
+    )
+    
+    # Download path
+    download_path = st.text_input(
+        "Download path:",
+        value=st.session_state.download_path
+    )
+    
+    # Update download path if changed
+    if download_path != st.session_state.download_path:
+        st.session_state.download_path = download_path
+        config.queue_preference_updates({"download_path": download_path})
+    
+    # Download button
+    if st.button("💾 Download Output"):
+        save_output_text(filename)
+
+
 # Main application
 def main():
     st.set_page_config(
@@ -266,8 +667,14 @@ def main():
         """
     )
     
+    # Pick up the result of a background transformation once it has finished
+    if st.session_state.transform_future is not None and st.session_state.transform_future.done():
+        collect_transformation()
+    transformation_running = st.session_state.transform_future is not None
+    
     # Check Ollama connection
     ollama_connected = check_ollama_connection()
+    st.session_state.ollama_connected = ollama_connected
     if st.session_state.ollama_error:
         st.error(
             f"{st.session_state.ollama_error} "
@@ -279,206 +686,25 @@ def main():
     
     # Left column (Input)
     with col1:
-        st.header("Input Text")
-        
-        # File upload
-        uploaded_file = st.file_uploader(
-            "Upload a file (TXT, Markdown, DOCX, PDF)",
-            type=["txt", "md", "docx", "pdf"]
-        )
-        if uploaded_file:
-            handle_file_upload(uploaded_file)
-        
-        # Input buttons row
-        input_col1, input_col2 = st.columns(2)
-        with input_col1:
-            # Paste button
-            if st.button("📋 Paste from Clipboard"):
-                handle_clipboard_paste()
-        
-        with input_col2:
-            # Clear input button
-            if st.button("🧹 Clear Input"):
-                st.session_state.input_text = ""
-        
-        # Input text area
-        st.session_state.input_text = st.text_area(
-            "Enter or paste text here:",
-            value=st.session_state.input_text,
-            height=400
-        )
+        render_input_column()
     
     # Middle column (Transformation Selector)
     with col2:
-        st.header("Transformations")
-        
-        # Model selection
-        model_options = st.session_state.available_models
-        
-        selected_model = st.selectbox(
-            "Select LLM Model:",
-            options=model_options,
-            index=model_options.index(st.session_state.ollama_model) if st.session_state.ollama_model in model_options else 0
-        )
-        
-        # Update model preference if changed
-        if selected_model != st.session_state.ollama_model:
-            st.session_state.ollama_model = selected_model
-            config.update_preference("model", selected_model)
-        
-        # Prominent Transform button at the top
-        transform_col1, transform_col2 = st.columns([3, 1])
-        with transform_col1:
-            if st.button("🔄 Transform Text", disabled=not ollama_connected, use_container_width=True, type="primary"):
-                transform_text()
-        
-        # Display success message if transformation was successful
-        if st.session_state.transformation_success:
-            st.success("Text transformed successfully!")
-            # Reset success flag after displaying
-            st.session_state.transformation_success = False
-        
-        # Search box for transformations
-        search_term = st.text_input(
-            "Search transformations:",
-            value=st.session_state.search_term
-        )
-        
-        # Update search term in session state
-        if search_term != st.session_state.search_term:
-            st.session_state.search_term = search_term
-        
-        # Filter prompts based on search term
-        filtered_prompts = prompt_utils.filter_prompts(
-            st.session_state.prompts_data,
-            st.session_state.search_term
-        )
-        
-        # Categorize prompts for better organization
-        if not st.session_state.search_term:
-            # Only categorize when not searching
-            if not st.session_state.transformation_categories:
-                st.session_state.transformation_categories = categorize_prompts(st.session_state.prompts_data)
-            categories = st.session_state.transformation_categories
-            
-            # Display transformations by category
-            st.write("Select transformations (up to 10):")
-            
-            # Create a container with scrollable height
-            transformation_container = st.container()
-            selected_transformations = []
-            
-            with transformation_container:
-                # Create tabs for categories
-                category_tabs = st.tabs(list(categories.keys()))
-                
-                # Display transformations in each category tab
-                for i, (category, tab) in enumerate(zip(categories.keys(), category_tabs)):
-                    with tab:
-                        for prompt_id, prompt_name in categories[category]:
-                            # Check if this prompt is already selected
-                            is_selected = prompt_id in st.session_state.selected_transformations
-                            
-                            # Create checkbox
-                            selected = st.checkbox(
-                                prompt_name,
-                                value=is_selected,
-                                key=f"checkbox_{prompt_id}"
-                            )
-                            
-                            # Add to selected transformations if checked
-                            if selected:
-                                selected_transformations.append(prompt_id)
-        else:
-            # When searching, display flat list of filtered results
-            prompt_options = prompt_utils.get_prompt_names_and_ids(filtered_prompts)
-            
-            # Display transformation options
-            st.write("Select transformations (up to 10):")
-            
-            # Create a container with scrollable height
-            transformation_container = st.container()
-            selected_transformations = []
-            
-            # Display transformations in the scrollable container
-            with transformation_container:
-                # Create checkboxes for each transformation
-                for prompt_id, prompt_name in prompt_options:
-                    # Check if this prompt is already selected
-                    is_selected = prompt_id in st.session_state.selected_transformations
-                    
-                    # Create checkbox
-                    selected = st.checkbox(
-                        prompt_name,
-                        value=is_selected,
-                        key=f"checkbox_{prompt_id}"
-                    )
-                    
-                    # Add to selected transformations if checked
-                    if selected:
-                        selected_transformations.append(prompt_id)
-        
-        # Limit to 10 transformations
-        if len(selected_transformations) > 10:
-            st.warning("You can select up to 10 transformations. Only the first 10 will be applied.")
-            selected_transformations = selected_transformations[:10]
-        
-        # Update selected transformations in session state
-        st.session_state.selected_transformations = selected_transformations
+        render_middle_column()
     
     # Right column (Output)
     with col3:
-        st.header("Output Text")
-        
-        # Output text area
-        st.session_state.output_text = st.text_area(
-            "Transformed text:",
-            value=st.session_state.output_text,
-            height=400
-        )
-        
-        # Output buttons row
-        output_col1, output_col2 = st.columns(2)
-        with output_col1:
-            # Copy to clipboard button
-            if st.button("📋 Copy to Clipboard"):
-                handle_clipboard_copy()
-        
-        with output_col2:
-            # Clear output button
-            if st.button("🧹 Clear Output"):
-                st.session_state.output_text = ""
-        
-        # Download section
-        st.subheader("Download Output")
-        
-        # Filename input
-        filename = st.text_input(
-            "Filename:",
-            value=st.session_state.suggested_filename
-        )
-        
-        # Download path
-        download_path = st.text_input(
-            "Download path:",
-            value=st.session_state.download_path
-        )
-        
-        # Update download path if changed
-        if download_path != st.session_state.download_path:
-            st.session_state.download_path = download_path
-            config.update_preference("download_path", download_path)
-        
-        # Download button
-        if st.button("💾 Download Output"):
-            save_output_text(filename)
+        # Only shown while a job runs, so the page stops polling once it finishes
+        if transformation_running:
+            render_transformation_progress()
+        render_output_column()
     
     # Bottom section for additional controls
     st.markdown("---")
     
     # Clear all button
-    if st.button("🧹 Clear All Fields"):
-        clear_all()
+    # Runs as a callback, before any widgets are created, so the selection widgets can be reset
+    st.button("🧹 Clear All Fields", on_click=clear_all)
     
     # Footer
     st.markdown("---")
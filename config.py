@@ -5,8 +5,12 @@ Handles user preferences and application settings.
 
 import os
 import json
+import atexit
+import threading
 from appdirs import user_config_dir
 
+import utils
+
 # Define app name for config directory
 APP_NAME = "ai-text-transformer-toolbox"
 
@@ -21,11 +25,18 @@ DEFAULT_CONFIG = {
     "last_used_transformations": ["basic_cleanup"]
 }
 
+# Seconds to wait for further changes before queued preferences are written
+SAVE_DELAY = 5.0
+
+# Preference updates waiting to be written, and the timer that will write them
+_pending_updates = {}
+_pending_timer = None
+_pending_lock = threading.Lock()
+
 
 def ensure_config_dir():
     """Ensure the config directory exists."""
-    if not os.path.exists(CONFIG_DIR):
-        os.makedirs(CONFIG_DIR, exist_ok=True)
+    os.makedirs(CONFIG_DIR, exist_ok=True)
 
 
 def load_preferences():
@@ -34,29 +45,37 @@ def load_preferences():
     
     if not os.path.exists(CONFIG_FILE):
         save_preferences(DEFAULT_CONFIG)
-        return DEFAULT_CONFIG
+        preferences = dict(DEFAULT_CONFIG)
+    else:
+        try:
+            preferences = utils.read_json_file(CONFIG_FILE)
+        except (json.JSONDecodeError, FileNotFoundError):
+            # If the file is corrupted or missing, reset to defaults
+            save_preferences(DEFAULT_CONFIG)
+            preferences = dict(DEFAULT_CONFIG)
     
-    try:
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        # If the file is corrupted or missing, reset to defaults
-        save_preferences(DEFAULT_CONFIG)
-        return DEFAULT_CONFIG
+    # Include updates that are queued but not yet written
+    with _pending_lock:
+        preferences.update(_pending_updates)
+    return preferences
 
 
 def save_preferences(preferences):
     """Save user preferences to the config file."""
     ensure_config_dir()
     
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(preferences, f, indent=2)
+    utils.write_json_file(CONFIG_FILE, preferences)
 
 
 def update_preference(key, value):
     """Update a specific preference."""
+    update_preferences({key: value})
+
+
+def update_preferences(updates):
+    """Update several preferences with a single load and save."""
     preferences = load_preferences()
-    preferences[key] = value
+    preferences.update(updates)
     save_preferences(preferences)
 
 
@@ -64,3 +83,39 @@ def get_preference(key, default=None):
     """Get a specific preference."""
     preferences = load_preferences()
     return preferences.get(key, default)
+
+
+def queue_preference_updates(updates):
+    """Queue preference updates and write them together after SAVE_DELAY seconds.
+    
+    Further updates within the delay restart the timer, so rapid changes
+    result in a single write.
+    """
+    global _pending_timer
+    
+    with _pending_lock:
+        _pending_updates.update(updates)
+        if _pending_timer is not None:
+            _pending_timer.cancel()
+        _pending_timer = threading.Timer(SAVE_DELAY, flush_preference_updates)
+        _pending_timer.daemon = True
+        _pending_timer.start()
+
+
+def flush_preference_updates():
+    """Write any queued preference updates immediately."""
+    global _pending_timer
+    
+    with _pending_lock:
+        if _pending_timer is not None:
+            _pending_timer.cancel()
+            _pending_timer = None
+        updates = dict(_pending_updates)
+        _pending_updates.clear()
+    
+    if updates:
+        update_preferences(updates)
+
+
+# Don't lose queued updates when the app shuts down
+atexit.register(flush_preference_updates)
@@ -3,12 +3,20 @@ File utility module for the AI Text Transformer Toolbox.
 Handles file reading, writing, and format conversions.
 """
 
-import os
 import io
+import re
 import docx
 import PyPDF2
-import tempfile
-from datetime import datetime
+import time
+
+# pypdfium2 is optional; it extracts PDF text considerably faster than PyPDF2
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# Characters that are not allowed in generated filenames (anything but letters, digits and "_")
+_NON_WORD_RE = re.compile(r"\W")
 
 
 def read_text_file(file_obj):
@@ -24,33 +32,23 @@ def read_markdown_file(file_obj):
 def read_docx_file(file_obj):
     """Read text from a DOCX file."""
     doc = docx.Document(file_obj)
-    full_text = []
-    for para in doc.paragraphs:
-        full_text.append(para.text)
-    return '\n'.join(full_text)
+    return '\n'.join(para.text for para in doc.paragraphs)
 
 
 def read_pdf_file(file_obj):
     """Read text from a PDF file."""
-    # Save the uploaded file to a temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-        temp_file.write(file_obj.read())
-        temp_path = temp_file.name
+    data = file_obj.read()
     
-    # Extract text from the PDF
-    text = ""
-    try:
-        with open(temp_path, 'rb') as f:
-            pdf_reader = PyPDF2.PdfReader(f)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text() + "\n"
-    finally:
-        # Clean up the temporary file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(data)
+        try:
+            return "\n".join(page.get_textpage().get_text_range() for page in pdf)
+        finally:
+            pdf.close()
     
-    return text
+    # PyPDF2 reads directly from an in-memory stream, no temporary file needed
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
 
 
 def read_file(file_obj, file_type):
@@ -71,13 +69,12 @@ def generate_filename(text, extension="txt"):
     """Generate a filename based on the text content and current date/time."""
     # Get the first few words of the text (up to 5 words)
     words = text.split()[:5]
-    title = "_".join(words).lower()
     
     # Remove special characters
-    title = "".join(c if c.isalnum() or c == "_" else "" for c in title)
+    title = _NON_WORD_RE.sub("", "_".join(words).lower())
     
     # Add timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     
     # Combine title and timestamp
     filename = f"{title}_{timestamp}.{extension}"
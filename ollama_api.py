@@ -4,19 +4,38 @@ Handles interactions with the Ollama API for text transformations.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import json
 
+# How long Ollama keeps a model loaded after the last request
+KEEP_ALIVE = "30m"
+
+# Appended to concatenated prompts so the model processes all transformations
+FINAL_INSTRUCTION = "\nApply ALL of the above transformations to the user's input text."
+
+
+class OllamaError(Exception):
+    """Raised when Ollama fails to generate text."""
+
 
 class OllamaAPI:
     def __init__(self, base_url="http://localhost:11434"):
         """Initialize the Ollama API client."""
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
+        
+        # Reuse connections across calls (HTTP keep-alive + pooling)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def list_models(self):
         """List available models from Ollama."""
         try:
-            response = requests.get(f"{self.api_url}/tags")
+            response = self.session.get(f"{self.api_url}/tags")
             if response.status_code == 200:
                 models = response.json().get("models", [])
                 return [model["name"] for model in models]
@@ -25,34 +44,92 @@ class OllamaAPI:
         except requests.RequestException:
             return []
     
-    def generate_text(self, model, prompt, system_prompt=None, temperature=0.7):
-        """Generate text using the specified model and prompt."""
+    def generate_text(self, model, prompt, system_prompt=None, temperature=0.7, cancel_event=None):
+        """Generate text using the specified model and prompt.
+        
+        Raises OllamaError if the request fails, like generate_text_stream.
+        """
+        return "".join(self.generate_text_stream(
+            model, prompt, system_prompt, temperature, cancel_event=cancel_event
+        ))
+    
+    def generate_text_stream(self, model, prompt, system_prompt=None, temperature=0.7, cancel_event=None):
+        """Generate text using the specified model and prompt, yielding chunks as they arrive.
+        
+        If cancel_event is set while streaming, the request is closed and generation stops.
+        Raises OllamaError if the request fails or Ollama reports an error mid-stream.
+        """
         url = f"{self.api_url}/generate"
         
         payload = {
             "model": model,
             "prompt": prompt,
             "temperature": temperature,
-            "stream": False
+            "keep_alive": KEEP_ALIVE,
+            "stream": True
         }
         
         if system_prompt:
             payload["system"] = system_prompt
         
+        # Don't start a request for a job that was cancelled while waiting
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        
         try:
-            response = requests.post(url, json=payload)
-            if response.status_code == 200:
-                return response.json().get("response", "")
-            else:
-                error_msg = f"Error: {response.status_code} - {response.text}"
-                return f"Failed to generate text. {error_msg}"
+            with self.session.post(url, json=payload, stream=True) as response:
+                if response.status_code != 200:
+                    error_msg = f"Error: {response.status_code} - {response.text}"
+                    raise OllamaError(f"Failed to generate text. {error_msg}")
+                
+                # Ollama streams one JSON object per line
+                for line in response.iter_lines():
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    # Errors after the response has started arrive as a line of their own
+                    if chunk.get("error"):
+                        raise OllamaError(f"Failed to generate text. Error: {chunk['error']}")
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
         except requests.RequestException as e:
-            return f"Failed to connect to Ollama API: {str(e)}"
+            raise OllamaError(f"Failed to connect to Ollama API: {str(e)}") from e
+    
+    def generate_batch(self, model, prompt, system_prompts, temperature=0.7, max_workers=4, cancel_event=None):
+        """Run the same prompt against several system prompts concurrently.
+        
+        Results are returned in the same order as system_prompts. Ollama only
+        processes requests in parallel when OLLAMA_NUM_PARALLEL allows it.
+        Each request is streamed so that setting cancel_event stops all of them.
+        """
+        def _generate(system_prompt):
+            return self.generate_text(model, prompt, system_prompt, temperature, cancel_event=cancel_event)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_generate, system_prompts))
+    
+    def preload_model(self, model):
+        """Load a model into memory in the background so the first request is fast."""
+        def _preload():
+            try:
+                # A generate request without a prompt only loads the model
+                self.session.post(
+                    f"{self.api_url}/generate",
+                    json={"model": model, "keep_alive": KEEP_ALIVE}
+                )
+            except requests.RequestException:
+                pass
+        
+        threading.Thread(target=_preload, daemon=True).start()
     
     def check_connection(self):
         """Check if Ollama API is accessible."""
         try:
-            response = requests.get(f"{self.base_url}/")
+            response = self.session.get(f"{self.base_url}/")
             return response.status_code == 200
         except requests.RequestException:
             return False
@@ -63,10 +140,29 @@ def concatenate_prompts(prompts):
     if not prompts:
         return ""
     
-    # Join all prompts with a separator
-    concatenated = "\n\n".join(prompts)
+    # Number each instruction so the model addresses every one exactly once,
+    # then finish with the final instruction, building the string in one join
+    parts = []
+    for i, prompt in enumerate(prompts, 1):
+        parts.append(f"{i}. {prompt}")
+        parts.append("\n\n")
+    parts[-1] = FINAL_INSTRUCTION
     
-    # Add a final instruction to ensure the model processes all transformations
-    final_instruction = "\nApply ALL of the above transformations to the user's input text."
+    return "".join(parts)
+
+
+def chain_transform(client, model, text, prompts, cancel_event=None):
+    """Apply prompts one after another, feeding each step's output into the next.
     
-    return concatenated + final_instruction
+    Raises OllamaError as soon as a step fails, so an error is never passed on as input.
+    """
+    for step, prompt in enumerate(prompts, 1):
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        try:
+            text = client.generate_text(
+                model=model, prompt=text, system_prompt=prompt, cancel_event=cancel_event
+            )
+        except OllamaError as e:
+            raise OllamaError(f"Step {step} of {len(prompts)}: {e}") from e
+    return text
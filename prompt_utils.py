@@ -5,13 +5,21 @@ Handles loading, filtering, and managing transformation prompts.
 
 import os
 import json
+import bisect
+import streamlit as st
 
+import utils
 
-def load_prompts(prompts_file="default_prompts.json"):
+
+# Prompts file shipped with the application
+DEFAULT_PROMPTS_FILE = "default_prompts.json"
+
+
+@st.cache_data(show_spinner=False)
+def load_prompts(prompts_file=DEFAULT_PROMPTS_FILE):
     """Load transformation prompts from a JSON file."""
     try:
-        with open(prompts_file, 'r') as f:
-            return json.load(f)
+        return utils.read_json_file(prompts_file)
     except (json.JSONDecodeError, FileNotFoundError) as e:
         print(f"Error loading prompts: {e}")
         return {}
@@ -38,20 +46,58 @@ def get_default_prompt():
     }
 
 
-def filter_prompts(prompts_data, search_term=""):
-    """Filter prompts based on a search term."""
+def build_search_index(prompts_data):
+    """Build a single lowercase search string covering all prompts.
+    
+    Returns the prompt IDs, the combined string (name, description and ID of
+    each prompt, separated by NUL characters) and the offset at which each
+    prompt's entry starts. Build it once and pass it to filter_prompts to
+    avoid rebuilding it for every search.
+    """
+    prompt_ids = list(prompts_data)
+    entries = []
+    starts = []
+    offset = 0
+    
+    for prompt_id in prompt_ids:
+        prompt_data = prompts_data[prompt_id]
+        entry = "\0".join((
+            prompt_data.get("name", "").lower(),
+            prompt_data.get("description", "").lower(),
+            prompt_id.lower(),
+            ""
+        ))
+        starts.append(offset)
+        entries.append(entry)
+        offset += len(entry)
+    
+    return prompt_ids, "".join(entries), starts
+
+
+def filter_prompts(prompts_data, search_term="", search_index=None):
+    """Filter prompts based on a search term.
+    
+    search_index must come from build_search_index(prompts_data); it is built
+    on the fly if omitted.
+    """
     if not search_term:
         return prompts_data
     
     search_term = search_term.lower()
+    if search_index is None:
+        search_index = build_search_index(prompts_data)
+    prompt_ids, haystack, starts = search_index
     filtered = {}
     
-    for prompt_id, prompt_data in prompts_data.items():
-        name = prompt_data.get("name", "").lower()
-        description = prompt_data.get("description", "").lower()
+    # Scan the combined string, jumping to the next prompt after each match
+    position = haystack.find(search_term)
+    while position != -1:
+        index = bisect.bisect_right(starts, position) - 1
+        prompt_id = prompt_ids[index]
+        filtered[prompt_id] = prompts_data[prompt_id]
         
-        if search_term in name or search_term in description or search_term in prompt_id.lower():
-            filtered[prompt_id] = prompt_data
+        next_start = starts[index + 1] if index + 1 < len(starts) else len(haystack)
+        position = haystack.find(search_term, next_start)
     
     return filtered
 
@@ -3,92 +3,436 @@ Utility functions for the AI Text Transformer Toolbox.
 """
 
 import os
+import json
+import shutil
+import time
+import hashlib
 import platform
+import tempfile
+import threading
 import subprocess
-from datetime import datetime
+import importlib.util
+from functools import lru_cache
 
+# orjson is optional; it parses and serializes JSON considerably faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyperclip is optional; it is the cross-platform clipboard fallback
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
+# Operating system name, looked up once at import
+_SYSTEM = platform.system()
+
+class _FilenameTranslationTable(dict):
+    """str.translate table mapping every character except letters, digits and "_" to "_".
+    
+    ASCII is filled in up front; other characters are worked out on first use and cached.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        for codepoint in range(128):
+            self.__missing__(codepoint)
+    
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        value = char if char.isalnum() or char == "_" else "_"
+        self[codepoint] = value
+        return value
+
+
+_FILENAME_TABLE = _FilenameTranslationTable()
+
+
+def read_json_file(path):
+    """Read and parse a JSON file, using orjson when it is available."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json_file(path, data):
+    """Write data to a JSON file with 2-space indentation, using orjson when it is available.
+    
+    The data goes to a temporary file in the same directory, which then replaces the
+    target, so concurrent readers never see a partly written file.
+    """
+    if orjson is not None:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(data, indent=2).encode('utf-8')
+    
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".",
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+@lru_cache(maxsize=1)
 def get_desktop_path():
     """Get the path to the user's desktop."""
     return os.path.join(os.path.expanduser("~"), "Desktop")
 
+@lru_cache(maxsize=32)
+def _encode_path(directory):
+    """Encode a path to filesystem bytes, cached since the same directories are reused."""
+    return os.fsencode(directory)
+
 def ensure_directory_exists(directory):
     """Ensure a directory exists, creating it if necessary."""
-    if not os.path.exists(directory):
-        os.makedirs(directory, exist_ok=True)
+    os.makedirs(_encode_path(directory), exist_ok=True)
     return directory
 
 def generate_suggested_filename(text, extension="txt"):
     """Generate a suggested filename based on the content."""
     # Extract the first line or first few words
-    first_line = text.split("\n", 1)[0].strip()
+    first_line = text.partition("\n")[0].strip()
     
-    # Limit to first 5 words
-    words = first_line.split()[:5]
+    # Limit to first 5 words (without splitting the rest of the line)
+    words = first_line.split(None, 5)[:5]
     filename_base = "_".join(words)
     
     # Clean the filename (remove special characters)
-    filename_base = "".join(c if c.isalnum() or c == "_" else "_" for c in filename_base)
+    filename_base = filename_base.translate(_FILENAME_TABLE)
     
     # Add timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     
-    # Combine and ensure it's not too long
-    filename = f"{filename_base}_{timestamp}.{extension}"
-    if len(filename) > 255:  # Max filename length for most filesystems
-        filename = f"{filename_base[:50]}_{timestamp}.{extension}"
+    # Combine, keeping well under the 255-character limit of most filesystems
+    return f"{filename_base[:50]}_{timestamp}.{extension}"
+
+# Absolute paths of the clipboard tools, resolved once at import (None if not installed)
+_XCLIP = shutil.which('xclip')
+_WL_COPY = shutil.which('wl-copy')
+_WL_PASTE = shutil.which('wl-paste')
+
+# Seconds to wait for a clipboard command before falling back to the next backend
+CLIPBOARD_TIMEOUT = 1.0
+
+def _copy_with_xclip(text):
+    """
+    Copy text to the clipboard using xclip.
+    xclip reads the whole input, then forks a background process that owns the
+    selection until another client takes it over, so each copy needs a fresh
+    process: a running xclip cannot be sent new contents.
+    """
+    # Output is discarded rather than captured: the forked selection owner
+    # would otherwise hold the pipes open until the timeout
+    result = subprocess.run(
+        [_XCLIP, '-selection', 'clipboard'],
+        input=text, encoding='utf-8', timeout=CLIPBOARD_TIMEOUT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=True
+    )
+    return result.returncode == 0
+
+def _copy_with_wl_copy(text):
+    """Copy text to the clipboard using wl-copy (Wayland)."""
+    # Output is discarded rather than captured: the forked selection owner
+    # would otherwise hold the pipes open until the timeout
+    result = subprocess.run(
+        [_WL_COPY],
+        input=text, encoding='utf-8', timeout=CLIPBOARD_TIMEOUT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=True
+    )
+    return result.returncode == 0
+
+def _copy_with_pyperclip(text):
+    """Copy text to the clipboard using pyperclip."""
+    pyperclip.copy(text)
+    return True
+
+def _paste_with_xclip():
+    """Read the clipboard using xclip."""
+    result = subprocess.run(
+        [_XCLIP, '-selection', 'clipboard', '-o'],
+        encoding='utf-8', timeout=CLIPBOARD_TIMEOUT,
+        capture_output=True, close_fds=True
+    )
+    if result.returncode == 0:
+        return result.stdout
+    return None
+
+def _paste_with_wl_paste():
+    """Read the clipboard using wl-paste (Wayland)."""
+    result = subprocess.run(
+        [_WL_PASTE, '--no-newline'],
+        encoding='utf-8', timeout=CLIPBOARD_TIMEOUT,
+        capture_output=True, close_fds=True
+    )
+    if result.returncode == 0:
+        return result.stdout
+    return None
+
+def _paste_with_pyperclip():
+    """Read the clipboard using pyperclip."""
+    return pyperclip.paste()
+
+# Opt-in, experimental: talk to the X server directly through python-xlib instead of running xclip
+USE_XLIB_CLIPBOARD = os.environ.get("TOOLBOX_XLIB_CLIPBOARD") == "1"
+
+# Largest clipboard content served in-process; bigger transfers need the INCR protocol, left to xclip
+_XLIB_MAX_BYTES = 200_000
+
+def _xlib_can_serve(text):
+    """Return True if text is small enough for the xlib backend to serve."""
+    return len(text.encode('utf-8')) <= _XLIB_MAX_BYTES
+
+def _serve_xlib_selection(xdisplay, window, text, digest):
+    """Answer clipboard requests from other clients until another client takes ownership."""
+    global _LAST_COPIED_DIGEST
+    from Xlib import X, Xatom
+    from Xlib.protocol import event as xevent
+    
+    targets = xdisplay.intern_atom('TARGETS')
+    utf8_string = xdisplay.intern_atom('UTF8_STRING')
     
-    return filename
+    # STRING is defined as Latin-1, so characters outside it are replaced there
+    contents = {
+        utf8_string: text.encode('utf-8'),
+        Xatom.STRING: text.encode('latin-1', 'replace')
+    }
+    
+    try:
+        while True:
+            event = xdisplay.next_event()
+            if event.type == X.SelectionClear:
+                break
+            if event.type != X.SelectionRequest:
+                continue
+            
+            # Old clients may leave the property unset and expect the target to be used
+            prop = event.property or event.target
+            if event.target == targets:
+                event.requestor.change_property(prop, Xatom.ATOM, 32, [targets, utf8_string, Xatom.STRING])
+            elif event.target in contents:
+                event.requestor.change_property(prop, event.target, 8, contents[event.target])
+            else:
+                prop = X.NONE
+            
+            event.requestor.send_event(xevent.SelectionNotify(
+                time=event.time,
+                requestor=event.requestor,
+                selection=event.selection,
+                target=event.target,
+                property=prop
+            ))
+            xdisplay.flush()
+    finally:
+        # The clipboard no longer holds our text once we stop owning it
+        if _LAST_COPIED_DIGEST == digest:
+            _LAST_COPIED_DIGEST = None
+        window.destroy()
+        xdisplay.close()
+
+def _copy_with_xlib(text):
+    """
+    Copy text to the clipboard in-process using python-xlib.
+    A background thread owns the selection and serves it until another client
+    (including a later copy) takes over.
+    """
+    global _LAST_COPIED_DIGEST
+    from Xlib import X, display
+    
+    if not _xlib_can_serve(text):
+        return False
+    
+    xdisplay = display.Display()
+    window = xdisplay.screen().root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+    clipboard = xdisplay.intern_atom('CLIPBOARD')
+    window.set_selection_owner(clipboard, X.CurrentTime)
+    
+    owner = xdisplay.get_selection_owner(clipboard)
+    if owner == X.NONE or owner.id != window.id:
+        window.destroy()
+        xdisplay.close()
+        return False
+    
+    # Remember what we own before serving, so losing ownership can forget it
+    digest = _text_digest(text)
+    _LAST_COPIED_DIGEST = digest
+    threading.Thread(target=_serve_xlib_selection, args=(xdisplay, window, text, digest), daemon=True).start()
+    return True
+
+def _paste_with_xlib():
+    """Read the clipboard in-process using python-xlib."""
+    from Xlib import X, display
+    
+    xdisplay = display.Display()
+    try:
+        window = xdisplay.screen().root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        clipboard = xdisplay.intern_atom('CLIPBOARD')
+        utf8_string = xdisplay.intern_atom('UTF8_STRING')
+        prop = xdisplay.intern_atom('TOOLBOX_CLIPBOARD')
+        window.convert_selection(clipboard, utf8_string, prop, X.CurrentTime)
+        xdisplay.flush()
+        
+        # Wait for the owner to answer
+        deadline = time.monotonic() + CLIPBOARD_TIMEOUT
+        while time.monotonic() < deadline:
+            if not xdisplay.pending_events():
+                time.sleep(0.005)
+                continue
+            event = xdisplay.next_event()
+            if event.type != X.SelectionNotify:
+                continue
+            if event.property == X.NONE:
+                return None
+            
+            reply = window.get_full_property(prop, X.AnyPropertyType)
+            # Large contents arrive in INCR chunks, which are left to xclip
+            if reply is None or reply.property_type == xdisplay.intern_atom('INCR'):
+                return None
+            value = reply.value
+            return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+        return None
+    finally:
+        xdisplay.close()
+
+@lru_cache(maxsize=1)
+def _clipboard_backends():
+    """
+    Work out which clipboard backends are worth trying, in order of preference.
+    Returns a tuple of (copy_backends, paste_backends).
+    """
+    copy_backends = []
+    paste_backends = []
+    
+    if _SYSTEM == "Linux":
+        if USE_XLIB_CLIPBOARD and os.environ.get("DISPLAY") and importlib.util.find_spec("Xlib"):
+            copy_backends.append(_copy_with_xlib)
+            paste_backends.append(_paste_with_xlib)
+        if _XCLIP:
+            copy_backends.append(_copy_with_xclip)
+            paste_backends.append(_paste_with_xclip)
+        if _WL_COPY and _WL_PASTE:
+            copy_backends.append(_copy_with_wl_copy)
+            paste_backends.append(_paste_with_wl_paste)
+    
+    # pyperclip works as a fallback on every platform
+    if pyperclip is not None:
+        copy_backends.append(_copy_with_pyperclip)
+        paste_backends.append(_paste_with_pyperclip)
+    
+    return tuple(copy_backends), tuple(paste_backends)
+
+# Backends that last worked, used directly on later calls
+_COPY_BACKEND = None
+_PASTE_BACKEND = None
+
+# Last clipboard read as (time.monotonic() timestamp, text), reused for PASTE_CACHE_TTL seconds
+PASTE_CACHE_TTL = 0.1
+_LAST_PASTE = None
+
+# Digest of the text the in-process xlib backend currently owns on the clipboard, to skip
+# repeated identical copies. Set only while we hold the selection, since the other backends
+# cannot tell when another application replaces the clipboard contents.
+_LAST_COPIED_DIGEST = None
+
+def _text_digest(text):
+    """Return a short content digest of text."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+
+def _copy_with_first_backend(text, backends):
+    """Copy text with the first backend that succeeds and return it, or None if all fail."""
+    for backend in backends:
+        try:
+            if backend(text):
+                return backend
+        except Exception:
+            continue
+    return None
 
 def try_copy_to_clipboard(text):
     """
     Try to copy text to clipboard using platform-specific methods.
     Returns True if successful, False otherwise.
     """
-    try:
-        # For Linux
-        if platform.system() == "Linux":
-            # Try using xclip
-            process = subprocess.Popen(
-                ['xclip', '-selection', 'clipboard'],
-                stdin=subprocess.PIPE, close_fds=True
-            )
-            process.communicate(input=text.encode('utf-8'))
-            return process.returncode == 0
-    except Exception:
-        pass
-    
-    # If we get here, the platform-specific method failed or isn't implemented
-    try:
-        # Try using pyperclip as a fallback
-        import pyperclip
-        pyperclip.copy(text)
+    global _COPY_BACKEND, _LAST_PASTE, _LAST_COPIED_DIGEST
+    
+    # Nothing to do if we still own the clipboard with this exact text
+    if _LAST_COPIED_DIGEST is not None and _text_digest(text) == _LAST_COPIED_DIGEST:
         return True
-    except Exception:
-        return False
+    
+    # The clipboard is about to change, so a cached paste is no longer valid
+    _LAST_PASTE = None
+    _LAST_COPIED_DIGEST = None
+    
+    copy_backends = _clipboard_backends()[0]
+    
+    # Text too large for the xlib backend goes to the other backends for this copy only,
+    # so later copies keep using whichever backend was remembered
+    if _copy_with_xlib in copy_backends and not _xlib_can_serve(text):
+        fallbacks = [backend for backend in copy_backends if backend is not _copy_with_xlib]
+        return _copy_with_first_backend(text, fallbacks) is not None
+    
+    # Use the backend that worked last time
+    if _COPY_BACKEND is not None:
+        try:
+            if _COPY_BACKEND(text):
+                return True
+        except Exception:
+            pass
+        _COPY_BACKEND = None
+    
+    # Otherwise try each available backend and remember the first that works
+    backend = _copy_with_first_backend(text, copy_backends)
+    if backend is not None:
+        _COPY_BACKEND = backend
+        return True
+    
+    return False
 
 def try_paste_from_clipboard():
     """
     Try to paste text from clipboard using platform-specific methods.
     Returns the clipboard text if successful, None otherwise.
     """
-    try:
-        # For Linux
-        if platform.system() == "Linux":
-            # Try using xclip
-            process = subprocess.Popen(
-                ['xclip', '-selection', 'clipboard', '-o'],
-                stdout=subprocess.PIPE, close_fds=True
-            )
-            stdout, _ = process.communicate()
-            if process.returncode == 0:
-                return stdout.decode('utf-8')
-    except Exception:
-        pass
-    
-    # If we get here, the platform-specific method failed or isn't implemented
-    try:
-        # Try using pyperclip as a fallback
-        import pyperclip
-        return pyperclip.paste()
-    except Exception:
-        return None
+    global _PASTE_BACKEND, _LAST_PASTE
+    
+    # Reuse a very recent read instead of querying the clipboard again
+    now = time.monotonic()
+    if _LAST_PASTE is not None and now - _LAST_PASTE[0] < PASTE_CACHE_TTL:
+        return _LAST_PASTE[1]
+    
+    # Use the backend that worked last time
+    if _PASTE_BACKEND is not None:
+        try:
+            text = _PASTE_BACKEND()
+            if text is not None:
+                _LAST_PASTE = (now, text)
+                return text
+        except Exception:
+            pass
+        _PASTE_BACKEND = None
+    
+    # Otherwise try each available backend and remember the first that works
+    for backend in _clipboard_backends()[1]:
+        try:
+            text = backend()
+            if text is not None:
+                _PASTE_BACKEND = backend
+                _LAST_PASTE = (now, text)
+                return text
+        except Exception:
+            continue
+    
+    return None